@@ -0,0 +1,351 @@
+import os
+import shutil
+import tempfile
+
+import streamlit as st
+import streamlit.components.v1 as components
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import plotly
+import plotly.graph_objects as go
+import polars as pl
+from numba import njit
+
+EXCEL_PATH = "Sample - Superstore.xlsx"
+PARQUET_PATH = "superstore.parquet"
+LTTB_THRESHOLD = 3000
+LTTB_POINTS = 2000
+AGGREGATE_COLUMNS = ["Order Date", "Product Name", "Sales", "Quantity", "Profit"]
+CATEGORY_COLUMNS = ["Region", "State", "Category", "Sub-Category", "Product Name"]
+
+# ---- Load Data ----
+def parquet_is_stale():
+    # The workbook may be absent once the Parquet cache exists (e.g. deployed
+    # without it); only rebuild when there is a newer workbook to rebuild from.
+    if not os.path.exists(PARQUET_PATH):
+        return True
+    if not os.path.exists(EXCEL_PATH):
+        return False
+    return os.path.getmtime(PARQUET_PATH) < os.path.getmtime(EXCEL_PATH)
+
+@st.cache_data
+def load_data():
+    # Parsing the workbook with openpyxl is slow, so convert it to Parquet once
+    # (again whenever the workbook changes) and memory-map the Parquet file.
+    if parquet_is_stale():
+        df = pd.read_excel(EXCEL_PATH, engine="openpyxl")
+        df["Order Date"] = pd.to_datetime(df["Order Date"]).astype("datetime64[ns]")
+        # Write to a temporary file and swap it in atomically, so an
+        # interrupted write or a concurrent reader never sees a partial file.
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(PARQUET_PATH)), suffix=".parquet.tmp"
+        )
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", compression="zstd", index=False)
+            os.replace(tmp_path, PARQUET_PATH)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    table = pq.read_table(PARQUET_PATH, memory_map=True)
+    df = table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    # Low-cardinality text columns become categoricals so filtering compares
+    # integer codes, and the measures are downcast to halve memory traffic.
+    for col in CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    df["Quantity"] = df["Quantity"].astype("int16")
+    df["Sales"] = df["Sales"].astype("float32")
+    df["Profit"] = df["Profit"].astype("float32")
+
+    # Sorted, NumPy-backed order dates let the date filter binary-search the
+    # range instead of comparing the whole column.
+    df["Order Date"] = df["Order Date"].astype("datetime64[ns]")
+    return df.sort_values("Order Date", kind="mergesort").reset_index(drop=True)
+
+@st.cache_resource
+def load_polars_frame():
+    # Polars copy of just the columns the aggregations read; they run on it
+    # multi-threaded instead of through single-threaded pandas groupbys.
+    return pl.from_pandas(load_data()[AGGREGATE_COLUMNS])
+
+@st.cache_resource
+def build_catalog():
+    # Cascading filter options for every reachable selection, built once from
+    # the distinct Region/State/Category/Sub-Category combinations so reruns
+    # only do dictionary lookups. "All" keys cover the unfiltered levels.
+    df = load_data()
+    combos = df[["Region", "State", "Category", "Sub-Category"]].dropna().drop_duplicates()
+    states, categories, subcats = {}, {}, {}
+    for region, state, category, subcat in combos.itertuples(index=False):
+        for region_key in (region, "All"):
+            states.setdefault(region_key, set()).add(state)
+            for state_key in (state, "All"):
+                categories.setdefault((region_key, state_key), set()).add(category)
+                for category_key in (category, "All"):
+                    subcats.setdefault((region_key, state_key, category_key), set()).add(subcat)
+    return {
+        "Region": df["Region"].cat.categories.tolist(),
+        "State": {key: sorted(values) for key, values in states.items()},
+        "Category": {key: sorted(values) for key, values in categories.items()},
+        "Sub-Category": {key: sorted(values) for key, values in subcats.items()},
+    }
+
+# ---- Filters ----
+@njit(cache=True)
+def filter_rows(region_codes, state_codes, category_codes, subcat_codes, r, s, c, sc, out):
+    # One pass over the category codes, writing matching row positions into
+    # out and returning how many matched. A code of -1 means "All".
+    k = 0
+    for i in range(region_codes.size):
+        if ((r < 0 or region_codes[i] == r)
+                and (s < 0 or state_codes[i] == s)
+                and (c < 0 or category_codes[i] == c)
+                and (sc < 0 or subcat_codes[i] == sc)):
+            out[k] = i
+            k += 1
+    return k
+
+def category_code(df, col, value):
+    if value == "All":
+        return -1
+    return df[col].cat.categories.get_loc(value)
+
+def apply_filters(df, region, state, category, subcat):
+    # All category filters are applied in one compiled pass that yields the
+    # matching row positions; the rows are never copied out of df.
+    row_buffer = np.empty(len(df), dtype=np.int64)
+    n_rows = filter_rows(
+        df["Region"].cat.codes.to_numpy(),
+        df["State"].cat.codes.to_numpy(),
+        df["Category"].cat.codes.to_numpy(),
+        df["Sub-Category"].cat.codes.to_numpy(),
+        category_code(df, "Region", region),
+        category_code(df, "State", state),
+        category_code(df, "Category", category),
+        category_code(df, "Sub-Category", subcat),
+        row_buffer,
+    )
+    return row_buffer[:n_rows]
+
+def apply_date_range(order_dates, rows, from_date, to_date):
+    # order_dates is sorted, so the range is two binary searches.
+    lo = np.searchsorted(order_dates, np.datetime64(from_date, "ns"), side="left")
+    hi = np.searchsorted(order_dates, np.datetime64(to_date, "ns"), side="right")
+    return rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+
+# ---- Aggregates ----
+@st.cache_resource
+def load_measure_matrix():
+    # Sales, Quantity and Profit side by side in one row-major float32 array,
+    # so the KPI totals need a single pass over the selected rows.
+    df = load_data()
+    return np.ascontiguousarray(
+        np.column_stack([df["Sales"], df["Quantity"], df["Profit"]]), dtype=np.float32
+    )
+
+def compute_totals(rows):
+    # Sales, Quantity and Profit totals plus the overall margin rate for the
+    # selected rows. Accumulate in 64 bits; float32 sums would lose cents.
+    if rows.size == 0:
+        return 0, 0, 0, 0
+    total_sales, total_quantity, total_profit = load_measure_matrix()[rows].sum(
+        axis=0, dtype=np.float64
+    )
+    margin_rate = (total_profit / total_sales) if total_sales != 0 else 0
+    return total_sales, total_quantity, total_profit, margin_rate
+
+@njit(fastmath=True, cache=True)
+def margin_rate_kernel(profit, sales, out):
+    # Profit / Sales in one pass; zero sales divide by 1 as before. Serial on
+    # purpose: the inputs are a few thousand rows, and a parallel kernel called
+    # from Streamlit's script thread hangs numba's TBB pool at exit.
+    for i in range(profit.size):
+        s = sales[i]
+        out[i] = profit[i] / s if s != 0.0 else profit[i]
+
+def add_margin_rate(df):
+    margin = np.empty(len(df), dtype=np.float32)
+    margin_rate_kernel(df["Profit"].to_numpy(np.float32), df["Sales"].to_numpy(np.float32), margin)
+    df["Margin Rate"] = margin
+    return df
+
+@st.cache_data(max_entries=64, ttl=3600)
+def compute_aggregates(region, state, category, subcat, from_date, to_date):
+    # Cached per filter selection, so reruns that only change the KPI
+    # selection reuse the aggregates instead of recomputing them. Rows are
+    # selected exactly as for the KPI totals and gathered once before grouping.
+    df = load_data()
+    rows = apply_filters(df, region, state, category, subcat)
+    rows = apply_date_range(df["Order Date"].to_numpy(), rows, from_date, to_date)
+    lf_filtered = load_polars_frame()[rows].lazy()
+    measures = [pl.col("Sales").sum(), pl.col("Quantity").sum(), pl.col("Profit").sum()]
+
+    daily_query = lf_filtered.group_by("Order Date").agg(measures).sort("Order Date")
+    product_query = (
+        lf_filtered.group_by("Product Name").agg(measures)
+        .with_columns(pl.col("Product Name").cast(pl.Utf8))
+        # Polars returns groups in arbitrary order; sort by name like pandas so
+        # positional tie-breaks downstream are stable.
+        .sort("Product Name")
+    )
+
+    # Collect both together so Polars can share the gathered rows, and hand the
+    # results back as Arrow-backed pandas so product names aren't boxed into
+    # Python objects.
+    daily_result, product_result = pl.collect_all([daily_query, product_query])
+    daily_grouped = add_margin_rate(daily_result.to_pandas(use_pyarrow_extension_array=True))
+    product_grouped = add_margin_rate(product_result.to_pandas(use_pyarrow_extension_array=True))
+    return daily_grouped, product_grouped
+
+def top_n_indices(values, n=10):
+    # Row indices of the n largest values in each KPI column, largest first.
+    # np.partition finds each column's n-th largest value in linear time, and
+    # only rows at or above it are stable-sorted, so equal values keep row
+    # order (product-name order for product_grouped).
+    if len(values) <= n:
+        return np.argsort(-values, axis=0, kind="stable")
+    top = np.empty((n, values.shape[1]), dtype=np.int64)
+    for i in range(values.shape[1]):
+        column = values[:, i]
+        threshold = np.partition(column, len(column) - n)[len(column) - n]
+        candidates = np.flatnonzero(column >= threshold)
+        top[:, i] = candidates[np.argsort(-column[candidates], kind="stable")[:n]]
+    return top
+
+# ---- Charts ----
+# Plotly WebGL line chart fed with raw typed-array bytes instead of JSON floats.
+# The frontend is served locally rather than from a CDN.
+BINARY_LINE_CHART_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "frontend", "binary_line_chart"
+)
+PLOTLY_JS_PATH = os.path.join(os.path.dirname(plotly.__file__), "package_data", "plotly.min.js")
+
+def sync_plotly_js(component_dir):
+    # Serve the plotly.js build shipped with the installed plotly package, so
+    # the renderer always matches the figure JSON plotly.py produces. Streamlit
+    # won't follow symlinks out of a component directory, so copy it in.
+    target = os.path.join(component_dir, "plotly.min.js")
+    source = os.stat(PLOTLY_JS_PATH)
+    if os.path.exists(target):
+        current = os.stat(target)
+        if (current.st_size, current.st_mtime_ns) == (source.st_size, source.st_mtime_ns):
+            return
+    fd, tmp_path = tempfile.mkstemp(dir=component_dir, suffix=".js.tmp")
+    os.close(fd)
+    try:
+        shutil.copy2(PLOTLY_JS_PATH, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+sync_plotly_js(BINARY_LINE_CHART_DIR)
+binary_line_chart_component = components.declare_component(
+    "binary_line_chart", path=BINARY_LINE_CHART_DIR
+)
+
+@njit(cache=True)
+def lttb_indices(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: pick n_out points that keep the shape
+    # of the series, always including the first and last point.
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(avg_start, avg_end):
+            avg_x += x[j] - x[0]
+            avg_y += y[j]
+        avg_x /= avg_end - avg_start
+        avg_y /= avg_end - avg_start
+
+        ax = float(x[a] - x[0])
+        ay = y[a]
+        max_area = -1.0
+        next_a = a
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - (x[j] - x[0])) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        out[i + 1] = next_a
+        a = next_a
+    return out
+
+def binary_line_chart(fig, series, height=450):
+    # Each series goes over as little-endian bytes (x in epoch milliseconds as
+    # float64, y as float32) that the browser views directly as typed arrays.
+    arrays = {}
+    for i, (_, x, y) in enumerate(series):
+        arrays[f"x{i}"] = np.ascontiguousarray(x.view("i8") / 1e6, dtype="<f8").tobytes()
+        arrays[f"y{i}"] = np.ascontiguousarray(y, dtype="<f4").tobytes()
+    binary_line_chart_component(
+        figure=fig.to_json(),
+        names=[name for name, _, _ in series],
+        height=height,
+        default=None,
+        **arrays,
+    )
+
+def build_charts(daily_grouped, product_grouped, kpi_selection):
+    # ---- Sales Trend Chart ----
+    st.subheader("Sales Trend Over Time")
+
+    # WebGL traces keep long date ranges interactive where SVG would stall.
+    # Long ranges are downsampled with LTTB so far fewer points are shipped.
+    dates = daily_grouped["Order Date"].to_numpy("datetime64[ns]")
+    series = []
+    for kpi in kpi_selection:
+        values = daily_grouped[kpi].to_numpy(np.float32)
+        if len(daily_grouped) > LTTB_THRESHOLD:
+            keep = lttb_indices(dates.view("i8"), values, LTTB_POINTS)
+            series.append((kpi, dates[keep], values[keep]))
+        else:
+            series.append((kpi, dates, values))
+
+    fig_line = go.Figure()
+    fig_line.update_layout(
+        title="KPI Trends Over Time",
+        xaxis_title="Date",
+        xaxis_type="date",
+        yaxis_title="value",
+        legend_title_text="variable",
+        showlegend=True,
+        template="plotly_white",
+    )
+    binary_line_chart(fig_line, series)
+
+    # ---- Top 10 Products Chart ----
+    st.subheader("Top 10 Products by KPI")
+
+    top_indices = top_n_indices(product_grouped[kpi_selection].to_numpy(np.float64))
+    for i, kpi in enumerate(kpi_selection):
+        top_10 = product_grouped.iloc[top_indices[:, i]]
+
+        # Plain arrays skip Plotly Express's DataFrame inference and validation.
+        values = top_10[kpi].to_numpy()
+        fig_bar = go.Figure(go.Bar(
+            x=values,
+            y=top_10["Product Name"].astype(str).to_numpy(),
+            orientation="h",
+            marker=dict(color=values, colorscale="Blues", colorbar=dict(title=kpi)),
+        ))
+        fig_bar.update_layout(
+            title=f"Top 10 Products by {kpi}",
+            xaxis_title=kpi,
+            yaxis_title="Product",
+            template="plotly_white",
+        )
+        st.plotly_chart(fig_bar, use_container_width=True)